@@ -0,0 +1,234 @@
+"""
+Windows fast paths for rsync_clone.py
+Lists directories with GetFileInformationByHandleEx and copies files with CopyFileExW
+"""
+
+import os
+import stat
+import ctypes
+from ctypes import wintypes
+
+
+kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+# CreateFileW arguments for opening a directory to list it
+FILE_LIST_DIRECTORY = 0x0001
+FILE_SHARE_ALL = 0x0001 | 0x0002 | 0x0004
+OPEN_EXISTING = 3
+FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+# FILE_INFO_BY_HANDLE_CLASS value returning many directory entries per call
+FILE_ID_BOTH_DIRECTORY_INFO = 10
+ERROR_ACCESS_DENIED = 5
+ERROR_NO_MORE_FILES = 18
+
+FILE_ATTRIBUTE_READONLY = 0x0001
+FILE_ATTRIBUTE_HIDDEN = 0x0002
+FILE_ATTRIBUTE_DIRECTORY = 0x0010
+FILE_ATTRIBUTE_REPARSE_POINT = 0x0400
+
+# Only this reparse tag is a symlink, junctions and cloud files are walked like directories
+IO_REPARSE_TAG_SYMLINK = 0xA000000C
+
+INVALID_FILE_ATTRIBUTES = 0xFFFFFFFF
+
+# Size of the buffer handed to GetFileInformationByHandleEx, fits hundreds of entries
+LIST_BUFFER_SIZE = 64 * 1024
+
+# Offset between the Windows epoch (1601) and the Unix epoch in 100 ns units
+EPOCH_OFFSET = 116444736000000000
+
+
+class FILE_ID_BOTH_DIR_INFO(ctypes.Structure):
+    _fields_ = [
+        ('NextEntryOffset', wintypes.DWORD),
+        ('FileIndex', wintypes.DWORD),
+        ('CreationTime', ctypes.c_longlong),
+        ('LastAccessTime', ctypes.c_longlong),
+        ('LastWriteTime', ctypes.c_longlong),
+        ('ChangeTime', ctypes.c_longlong),
+        ('EndOfFile', ctypes.c_longlong),
+        ('AllocationSize', ctypes.c_longlong),
+        ('FileAttributes', wintypes.DWORD),
+        ('FileNameLength', wintypes.DWORD),
+        ('EaSize', wintypes.DWORD),
+        ('ShortNameLength', ctypes.c_byte),
+        ('ShortName', wintypes.WCHAR * 12),
+        ('FileId', ctypes.c_longlong),
+        ('FileName', wintypes.WCHAR * 1),
+    ]
+
+
+class BY_HANDLE_FILE_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ('dwFileAttributes', wintypes.DWORD),
+        ('ftCreationTime', wintypes.FILETIME),
+        ('ftLastAccessTime', wintypes.FILETIME),
+        ('ftLastWriteTime', wintypes.FILETIME),
+        ('dwVolumeSerialNumber', wintypes.DWORD),
+        ('nFileSizeHigh', wintypes.DWORD),
+        ('nFileSizeLow', wintypes.DWORD),
+        ('nNumberOfLinks', wintypes.DWORD),
+        ('nFileIndexHigh', wintypes.DWORD),
+        ('nFileIndexLow', wintypes.DWORD),
+    ]
+
+
+kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                 wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+kernel32.CreateFileW.restype = wintypes.HANDLE
+kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+kernel32.CloseHandle.restype = wintypes.BOOL
+kernel32.GetFileInformationByHandle.argtypes = [wintypes.HANDLE, ctypes.POINTER(BY_HANDLE_FILE_INFORMATION)]
+kernel32.GetFileInformationByHandle.restype = wintypes.BOOL
+kernel32.GetFileInformationByHandleEx.argtypes = [wintypes.HANDLE, ctypes.c_int, wintypes.LPVOID, wintypes.DWORD]
+kernel32.GetFileInformationByHandleEx.restype = wintypes.BOOL
+kernel32.CopyFileExW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.LPVOID, wintypes.LPVOID,
+                                 ctypes.POINTER(wintypes.BOOL), wintypes.DWORD]
+kernel32.CopyFileExW.restype = wintypes.BOOL
+kernel32.GetFileAttributesW.argtypes = [wintypes.LPCWSTR]
+kernel32.GetFileAttributesW.restype = wintypes.DWORD
+kernel32.SetFileAttributesW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD]
+kernel32.SetFileAttributesW.restype = wintypes.BOOL
+
+
+def filetime_to_ns(filetime: int) -> int:
+    """Convert a FILETIME value to nanoseconds since the Unix epoch"""
+    return (filetime - EPOCH_OFFSET) * 100
+
+
+class DirEntry:
+    """Minimal stand-in for os.DirEntry with the stat result filled in from the listing"""
+
+    __slots__ = ('name', 'path', '_attributes', '_reparse_tag', '_stat')
+
+    def __init__(self, name: str, path: str, attributes: int, reparse_tag: int, stat_result: os.stat_result):
+        self.name = name
+        self.path = path
+        self._attributes = attributes
+        self._reparse_tag = reparse_tag
+        self._stat = stat_result
+
+    def is_dir(self) -> bool:
+        return bool(self._attributes & FILE_ATTRIBUTE_DIRECTORY)
+
+    def is_symlink(self) -> bool:
+        return self._reparse_tag == IO_REPARSE_TAG_SYMLINK
+
+    def stat(self) -> os.stat_result:
+        # A symlink's own metadata describes the link, follow it like os.DirEntry
+        if self.is_symlink():
+            return os.stat(self.path)
+        return self._stat
+
+
+class ScandirIterator:
+    """Context manager and iterator over a directory, like the one os.scandir returns"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.handle = kernel32.CreateFileW(path, FILE_LIST_DIRECTORY, FILE_SHARE_ALL, None,
+                                           OPEN_EXISTING, FILE_FLAG_BACKUP_SEMANTICS, None)
+        if self.handle == INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        # st_dev for every entry, same value os.stat reports
+        info = BY_HANDLE_FILE_INFORMATION()
+        if not kernel32.GetFileInformationByHandle(self.handle, ctypes.byref(info)):
+            error = ctypes.get_last_error()
+            self.close()
+            raise ctypes.WinError(error)
+        self.volume_serial = info.dwVolumeSerialNumber
+        self.entries = self._list_entries()
+
+    def _list_entries(self):
+        """Fetch entries from the open handle, hundreds per system call"""
+        buffer = ctypes.create_string_buffer(LIST_BUFFER_SIZE)
+        name_offset = FILE_ID_BOTH_DIR_INFO.FileName.offset
+        while self.handle is not None:
+            if not kernel32.GetFileInformationByHandleEx(self.handle, FILE_ID_BOTH_DIRECTORY_INFO,
+                                                         buffer, LIST_BUFFER_SIZE):
+                error = ctypes.get_last_error()
+                if error == ERROR_NO_MORE_FILES:
+                    return
+                raise ctypes.WinError(error)
+
+            offset = 0
+            while True:
+                address = ctypes.addressof(buffer) + offset
+                info = FILE_ID_BOTH_DIR_INFO.from_address(address)
+                name = ctypes.wstring_at(address + name_offset, info.FileNameLength // 2)
+                if name not in ('.', '..'):
+                    yield self._make_entry(name, info)
+                if not info.NextEntryOffset:
+                    break
+                offset += info.NextEntryOffset
+
+    def _make_entry(self, name: str, info: FILE_ID_BOTH_DIR_INFO) -> DirEntry:
+        """Build a DirEntry with the stat result os.stat would report"""
+        attributes = info.FileAttributes
+        # EaSize holds the reparse tag when the entry is a reparse point
+        reparse_tag = info.EaSize if attributes & FILE_ATTRIBUTE_REPARSE_POINT else 0
+        if attributes & FILE_ATTRIBUTE_DIRECTORY:
+            mode = stat.S_IFDIR | 0o555
+        else:
+            mode = stat.S_IFREG | 0o444
+        if not attributes & FILE_ATTRIBUTE_READONLY:
+            mode |= 0o222
+
+        atime_ns = filetime_to_ns(info.LastAccessTime)
+        mtime_ns = filetime_to_ns(info.LastWriteTime)
+        ctime_ns = filetime_to_ns(info.CreationTime)
+        stat_result = os.stat_result(
+            (mode, info.FileId & 0xFFFFFFFFFFFFFFFF, self.volume_serial, 1, 0, 0, info.EndOfFile,
+             atime_ns // 10**9, mtime_ns // 10**9, ctime_ns // 10**9),
+            {'st_atime': atime_ns / 1e9, 'st_mtime': mtime_ns / 1e9, 'st_ctime': ctime_ns / 1e9,
+             'st_atime_ns': atime_ns, 'st_mtime_ns': mtime_ns, 'st_ctime_ns': ctime_ns}
+        )
+        return DirEntry(name, os.path.join(self.path, name), attributes, reparse_tag, stat_result)
+
+    def __iter__(self):
+        return self.entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.handle is not None:
+            kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+
+def scandir(path: str) -> ScandirIterator:
+    """
+    List a directory with GetFileInformationByHandleEx(FileIdBothDirectoryInfo)
+    Unlike os.scandir on Windows, each entry's stat includes st_ino and st_dev
+    """
+    return ScandirIterator(path)
+
+
+def copy_file(source_path: str, dest_path: str):
+    """
+    Copy a file with CopyFileExW, which preserves timestamps and attributes
+    and uses block cloning on ReFS where Windows supports it
+    """
+    if kernel32.CopyFileExW(source_path, dest_path, None, None, None, 0):
+        return
+    error = ctypes.get_last_error()
+
+    # CopyFileExW refuses to overwrite hidden or read-only files, and it copies
+    # those attributes, so clear them on the destination and try once more
+    if error == ERROR_ACCESS_DENIED:
+        attributes = kernel32.GetFileAttributesW(dest_path)
+        protected = FILE_ATTRIBUTE_HIDDEN | FILE_ATTRIBUTE_READONLY
+        if attributes != INVALID_FILE_ATTRIBUTES and attributes & protected:
+            if kernel32.SetFileAttributesW(dest_path, attributes & ~protected):
+                if kernel32.CopyFileExW(source_path, dest_path, None, None, None, 0):
+                    return
+                error = ctypes.get_last_error()
+                kernel32.SetFileAttributesW(dest_path, attributes)
+    raise ctypes.WinError(error)
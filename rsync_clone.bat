@@ -8,6 +8,7 @@ if "%1"=="" (
     echo Options:
     echo   --dry-run    Show what would be done without actually doing it
     echo   --verbose    Show detailed output
+    echo   --checksum   Compare hashes even when size and time match
     echo.
     echo Examples:
     echo   rsync_clone.bat C:\Source C:\Backup
@@ -1,5 +1,5 @@
 # PowerShell script to run rsync_clone.py
-# Usage: .\rsync_clone.ps1 -Source "C:\Source" -Destination "C:\Backup" [-DryRun] [-Verbose]
+# Usage: .\rsync_clone.ps1 -Source "C:\Source" -Destination "C:\Backup" [-DryRun] [-Verbose] [-Checksum]
 
 param(
     [Parameter(Mandatory=$true)]
@@ -9,7 +9,8 @@ param(
     [string]$Destination,
     
     [switch]$DryRun,
-    [switch]$Verbose
+    [switch]$Verbose,
+    [switch]$Checksum
 )
 
 # Build command arguments
@@ -23,6 +24,10 @@ if ($Verbose) {
     $args += "--verbose"
 }
 
+if ($Checksum) {
+    $args += "--checksum"
+}
+
 # Check if Python is available
 try {
     $pythonVersion = python --version 2>&1
@@ -1,23 +1,112 @@
 #!/usr/bin/env python3
 """
 Windows rsync-like program for folder synchronization
-Only overwrites files that have changed based on file hash comparison
+Only overwrites files whose size, modification time or contents have changed
 """
 
 import os
+import stat
+import errno
 import sys
 import shutil
 import hashlib
 import argparse
 import logging
+import threading
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Set, Tuple, List
-import json
+from typing import Dict, Set, Tuple, List, Optional
+import sqlite3
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Native directory listing and copying on Windows, see _win32.py
+if sys.platform == 'win32':
+    try:
+        import _win32
+    except (ImportError, OSError, AttributeError):
+        _win32 = None
+else:
+    _win32 = None
+
+
+# Change detection hash: BLAKE3 when the optional extension is installed
+HASH_ALGORITHM = 'blake3' if blake3 is not None else 'sha256'
+
+# Bump whenever the layout or hash algorithm of cache entries changes
+CACHE_VERSION = 6
+
+# Cache entries no run has used for this many days are deleted
+CACHE_EXPIRY_DAYS = 90
+
+# Largest read for BLAKE3, large enough for update() to spread each read across threads
+HASH_BUFSIZE = 1024 * 1024
+
+# Buffer size for user-space copies when no in-kernel copy is available
+COPY_BUFSIZE = 8 * 1024 * 1024
+
+# Largest request passed to copy_file_range/sendfile in one call
+KERNEL_COPY_CHUNK = 1024 * 1024 * 1024
+
+# Errors meaning an in-kernel copy is not supported for this pair of files
+KERNEL_COPY_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL,
+                           errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+# Files the tree walk may queue up ahead of the worker threads
+QUEUE_SIZE = 1024
+
+# Units used by format_bytes, each 1024 times the previous one
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Minimum time between progress redraws (20 Hz)
+PROGRESS_INTERVAL_NS = 50_000_000
+
+# Characters cycled through by the progress spinner
+SPINNER = '|/-\\'
+
+# Modification times this close are treated as equal (filesystem precision)
+MTIME_TOLERANCE_NS = 1_000_000_000
+
+# Quick check decisions
+SKIP = 0
+COPY = 1
+COMPARE = 2
+
+
+def new_sha256():
+    """Create a SHA256 hasher, preferring the OpenSSL (SHA-NI / ARMv8) backend"""
+    try:
+        return hashlib.new('sha256', usedforsecurity=False)
+    except TypeError:
+        # usedforsecurity was added in Python 3.9
+        return hashlib.new('sha256')
+
+
+def quick_check(source_size: int, source_mtime_ns: int, dest_size: int, dest_mtime_ns: int) -> int:
+    """
+    rsync-style quick check on size and modification time
+    
+    Returns:
+        SKIP if the files match, COPY if the sizes differ,
+        COMPARE if only the file contents can decide
+    """
+    # Different sizes can never have the same content
+    if source_size != dest_size:
+        return COPY
+    if abs(source_mtime_ns - dest_mtime_ns) <= MTIME_TOLERANCE_NS:
+        return SKIP
+    return COMPARE
 
 
 class RsyncClone:
-    def __init__(self, source: str, destination: str, dry_run: bool = False, verbose: bool = False):
+    def __init__(self, source: str, destination: str, dry_run: bool = False, verbose: bool = False,
+                 checksum: bool = False):
         """
         Initialize the rsync clone
         
@@ -26,14 +115,16 @@ class RsyncClone:
             destination: Destination directory path
             dry_run: If True, only show what would be done without actually doing it
             verbose: If True, show detailed output
+            checksum: If True, compare cached hashes of same-size files even when mtimes match
         """
         self.source = Path(source).resolve()
         self.destination = Path(destination).resolve()
         self.dry_run = dry_run
         self.verbose = verbose
+        self.checksum = checksum
         
         # Mac hidden folders to exclude
-        self.mac_exclusions = {'.DS_Store', '__MACOSX', '.AppleDouble', '.LSOverride', '.Spotlight-V100', '.Trashes', '.fseventsd'}
+        self.mac_exclusions = frozenset({'.DS_Store', '__MACOSX', '.AppleDouble', '.LSOverride', '.Spotlight-V100', '.Trashes', '.fseventsd'})
         
         # Statistics
         self.stats = {
@@ -45,65 +136,165 @@ class RsyncClone:
             'bytes_copied': 0,
             'errors': 0
         }
+        self.stats_lock = threading.Lock()
+        
+        # Destination directories known to exist, avoids a stat per copied file
+        self.known_dirs = set()
         
         # Progress tracking
-        self.total_files = 0
         self.processed_files = 0
+        self.last_progress_ns = 0
+        
+        # Worker threads for hashing, OpenSSL and BLAKE3 release the GIL
+        self.cpu_count = os.cpu_count() or 1
+        self.max_workers = min(32, self.cpu_count * 4)
+        self.max_pending = self.max_workers * 4
+        self.scan_error = None
         
-        # File cache for performance
-        self.cache_file = Path('.rsync_cache.json')
-        self.file_cache = self.load_cache()
+        # Files being hashed right now, BLAKE3 only gets the cores they leave idle
+        self.active_hashes = 0
+        self.hash_lock = threading.Lock()
         
         # Setup logging
         self.setup_logging()
+        self.check_hash_backend()
+        
+        # File cache for performance, hashes are only needed with --checksum
+        self.cache_file = Path('.rsync_cache.db')
+        self.cache_lock = threading.Lock()
+        self.cache_day = int(time.time() // 86400)
+        self.file_cache = self.load_cache() if self.checksum else None
+        self.pending_cache = {}
         
         # Validate paths
         self.validate_paths()
     
-    def load_cache(self) -> Dict:
-        """Load file cache from disk"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return {}
-        return {}
+    def increment_stat(self, name: str, amount: int = 1):
+        """Thread-safe increment of a statistics counter"""
+        with self.stats_lock:
+            self.stats[name] += amount
     
-    def save_cache(self):
-        """Save file cache to disk"""
+    def load_cache(self) -> sqlite3.Connection:
+        """
+        Open the SQLite file cache, creating it if needed
+        Entries from an older cache version or another hash algorithm are discarded
+        
+        Returns:
+            Database connection, or None if the cache cannot be opened
+        """
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.file_cache, f, indent=2)
-        except IOError:
-            pass
-    
-    def get_cache_key(self, file_path: Path) -> str:
-        """Generate cache key for file"""
-        return str(file_path.resolve())
-    
-    def is_file_cached_and_unchanged(self, file_path: Path) -> bool:
-        """Check if file is in cache and unchanged"""
-        cache_key = self.get_cache_key(file_path)
-        if cache_key not in self.file_cache:
-            return False
+            # Worker threads share the connection, access is serialized by cache_lock
+            conn = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            row = conn.execute("SELECT value FROM meta WHERE key = 'algorithm'").fetchone()
+            if version != CACHE_VERSION or row is None or row[0] != HASH_ALGORITHM:
+                conn.execute("DROP TABLE IF EXISTS files")
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('algorithm', ?)",
+                             (HASH_ALGORITHM,))
+                conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+            
+            conn.execute("CREATE TABLE IF NOT EXISTS files "
+                         "(key TEXT PRIMARY KEY, size INT, mtime_ns INT, hash BLOB, last_seen INT)")
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            self.logger.warning("Could not open cache %s, continuing without it: %s", self.cache_file, e)
+            return None
+    
+    def save_cache(self):
+        """
+        Write pending cache updates in a single transaction and close the cache
+        Entries not used for CACHE_EXPIRY_DAYS are pruned in the same transaction
+        Nothing is written when no file changed and every entry was already used today
+        """
+        if self.file_cache is None:
+            return
         
         try:
-            stat = file_path.stat()
-            cached = self.file_cache[cache_key]
-            return (cached['size'] == stat.st_size and 
-                   abs(cached['mtime'] - stat.st_mtime) <= 1.0)
-        except (OSError, KeyError):
-            return False
+            with self.cache_lock:
+                if self.pending_cache:
+                    with self.file_cache:
+                        self.file_cache.executemany(
+                            "INSERT OR REPLACE INTO files (key, size, mtime_ns, hash, last_seen) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            [(key,) + entry + (self.cache_day,) for key, entry in self.pending_cache.items()]
+                        )
+                        # Deleted files and files replaced by a new inode are never looked up again
+                        self.file_cache.execute("DELETE FROM files WHERE last_seen < ?",
+                                                (self.cache_day - CACHE_EXPIRY_DAYS,))
+                    self.pending_cache.clear()
+                self.file_cache.close()
+        except sqlite3.Error as e:
+            self.logger.warning("Could not save cache %s: %s", self.cache_file, e)
+        self.file_cache = None
     
-    def update_file_cache(self, file_path: Path, file_info: Dict):
-        """Update cache with file information"""
-        cache_key = self.get_cache_key(file_path)
-        self.file_cache[cache_key] = {
-            'size': file_info['size'],
-            'mtime': file_info['mtime'],
-            'hash': file_info['hash']
+    def get_cache_key(self, file_path: str, stat: os.stat_result) -> Optional[str]:
+        """
+        Generate cache key for file from its device and inode numbers
+        Needs no path resolution and follows renames on the same filesystem
+        Returns None on filesystems without inode numbers, so the file is not cached
+        """
+        if not stat.st_ino:
+            # os.scandir leaves st_dev and st_ino at zero on Windows
+            stat = os.stat(file_path)
+            if not stat.st_ino:
+                return None
+        return f"{stat.st_dev}:{stat.st_ino}"
+    
+    def get_cached_file_info(self, cache_key: str, stat: os.stat_result) -> Dict:
+        """
+        Look up a file in the cache
+        
+        Args:
+            cache_key: Cache key of the file
+            stat: Stat result of the file
+            
+        Returns:
+            Cached file information if the file is unchanged, None otherwise
+        """
+        if self.file_cache is None or cache_key is None:
+            return None
+        
+        with self.cache_lock:
+            row = self.pending_cache.get(cache_key)
+            last_seen = self.cache_day
+            if row is None:
+                row = self.file_cache.execute(
+                    "SELECT size, mtime_ns, hash, last_seen FROM files WHERE key = ?",
+                    (cache_key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                last_seen = row[3]
+        
+        # Same inode, so any change to the contents shows up in size or mtime_ns
+        size, mtime_ns, file_hash = row[:3]
+        if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+            return None
+        file_info = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'hash': file_hash
         }
+        
+        # Mark the entry as used at most once a day, so save_cache keeps it
+        if last_seen < self.cache_day:
+            self.update_file_cache(cache_key, file_info)
+        return file_info
+    
+    def update_file_cache(self, cache_key: str, file_info: Dict):
+        """Queue a cache update, written in one batch by save_cache"""
+        if self.file_cache is None or cache_key is None:
+            return
+        
+        with self.cache_lock:
+            self.pending_cache[cache_key] = (
+                file_info['size'], file_info['mtime_ns'], file_info['hash']
+            )
     
     def setup_logging(self):
         """Setup logging configuration"""
@@ -131,22 +322,30 @@ class RsyncClone:
         self.logger.addHandler(console_handler)
         self.logger.addHandler(file_handler)
     
-    def safe_log(self, level, message, path=None):
-        """Safe logging that handles Unicode paths"""
+    def check_hash_backend(self):
+        """Log the available hash algorithms and warn if SHA256 is not OpenSSL-backed"""
+        self.logger.debug("Hash algorithms available: %s", ', '.join(sorted(hashlib.algorithms_available)))
+        self.logger.debug("Change detection hash: %s", HASH_ALGORITHM)
+        if blake3 is not None:
+            return
+        
+        # OpenSSL hashers live in _hashlib; anything else is the slower builtin fallback
+        if type(new_sha256()).__module__ != '_hashlib':
+            self.logger.warning("Python is not using OpenSSL for SHA256, "
+                                "hashing will not use SHA-NI/ARMv8 acceleration")
+    
+    def safe_log(self, level: int, message: str, *args):
+        """
+        Log with lazy %-style formatting that handles Unicode paths
+        Nothing is formatted when the level is disabled
+        """
+        if not self.logger.isEnabledFor(level):
+            return
         try:
-            if path:
-                log_message = f"{message}: {path}"
-            else:
-                log_message = message
-            getattr(self.logger, level)(log_message)
+            self.logger.log(level, message, *args)
         except UnicodeEncodeError:
             # Fallback to safe representation
-            if path:
-                safe_path = path.name if hasattr(path, 'name') else str(path)
-                log_message = f"{message}: {safe_path} (Unicode path)"
-            else:
-                log_message = message
-            getattr(self.logger, level)(log_message)
+            self.logger.log(level, message, *(ascii(str(arg)) for arg in args))
     
     def validate_paths(self):
         """Validate source and destination paths"""
@@ -160,240 +359,492 @@ class RsyncClone:
         if not self.destination.exists():
             if not self.dry_run:
                 self.destination.mkdir(parents=True, exist_ok=True)
-                self.logger.info(f"Created destination directory: {self.destination}")
+                self.logger.info("Created destination directory: %s", self.destination)
             else:
-                self.logger.info(f"Would create destination directory: {self.destination}")
-            self.stats['directories_created'] += 1
+                self.logger.info("Would create destination directory: %s", self.destination)
+            self.increment_stat('directories_created')
     
-    def calculate_file_hash(self, file_path: Path, chunk_size: int = 8192) -> str:
+    def calculate_file_hash(self, file_path: str, file_size: int,
+                            chunk_size: int = 1024 * 1024) -> bytes:
         """
-        Calculate SHA256 hash of a file
+        Calculate BLAKE3 hash of a file, or SHA256 if blake3 is not installed
         
         Args:
             file_path: Path to the file
-            chunk_size: Size of chunks to read at a time
+            file_size: Size of the file in bytes from its stat
+            chunk_size: Size of chunks to read at a time (SHA256 on Python < 3.11 only)
             
         Returns:
-            SHA256 hash as hexadecimal string
+            Raw hash digest, empty on error
         """
-        sha256_hash = hashlib.sha256()
-        
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(chunk_size), b""):
-                    sha256_hash.update(chunk)
-            return sha256_hash.hexdigest()
+            with open(file_path, "rb", buffering=0) as f:
+                if blake3 is not None:
+                    return self.calculate_blake3(f, file_size)
+                
+                # Python 3.11+ runs the whole read/update loop in C
+                if hasattr(hashlib, 'file_digest'):
+                    return hashlib.file_digest(f, new_sha256).digest()
+                
+                sha256_hash = new_sha256()
+                buffer = bytearray(chunk_size)
+                view = memoryview(buffer)
+                while True:
+                    size = f.readinto(view)
+                    if not size:
+                        break
+                    sha256_hash.update(view[:size])
+                return sha256_hash.digest()
         except (IOError, OSError) as e:
-            self.logger.error(f"Error calculating hash for {file_path}: {e}")
-            self.stats['errors'] += 1
-            return ""
+            self.logger.error("Error calculating hash for %s: %s", file_path, e)
+            self.increment_stat('errors')
+            return b""
     
-    def get_file_info(self, file_path: Path) -> Dict:
+    def calculate_blake3(self, f, file_size: int) -> bytes:
+        """
+        Hash an open file with BLAKE3, spreading each read across the idle cores
+        
+        Args:
+            f: File opened for unbuffered binary reading
+            file_size: Size of the file in bytes from its stat
+            
+        Returns:
+            Raw hash digest
+        """
+        with self.hash_lock:
+            self.active_hashes += 1
+            max_threads = max(1, self.cpu_count - self.active_hashes + 1)
+        try:
+            # Small files do not need a full buffer, a file that grew since
+            # its stat is still read to EOF, just in more reads
+            view = memoryview(bytearray(min(HASH_BUFSIZE, max(file_size + 1, 64 * 1024))))
+            hasher = blake3.blake3(max_threads=max_threads)
+            while True:
+                size = f.readinto(view)
+                if not size:
+                    break
+                hasher.update(view[:size])
+            return hasher.digest()
+        finally:
+            with self.hash_lock:
+                self.active_hashes -= 1
+    
+    def get_file_info(self, file_path: str, stat: os.stat_result) -> Dict:
         """
         Get file information including hash, size, and modification time
         Uses cache to avoid re-reading unchanged files
         
         Args:
             file_path: Path to the file
+            stat: Stat result of the file
             
         Returns:
             Dictionary with file information
         """
         try:
-            stat = file_path.stat()
-            
-            # Check if file is cached and unchanged
-            if self.is_file_cached_and_unchanged(file_path):
-                cache_key = self.get_cache_key(file_path)
-                cached = self.file_cache[cache_key]
-                return {
-                    'path': file_path,
-                    'size': cached['size'],
-                    'mtime': cached['mtime'],
-                    'hash': cached['hash']
-                }
-            
-            # File changed or not cached, calculate hash
-            file_hash = self.calculate_file_hash(file_path)
-            file_info = {
-                'path': file_path,
-                'size': stat.st_size,
-                'mtime': stat.st_mtime,
-                'hash': file_hash
-            }
-            
-            # Update cache
-            self.update_file_cache(file_path, file_info)
-            
-            return file_info
+            cache_key = self.get_cache_key(file_path, stat)
+        except (IOError, OSError):
+            cache_key = None
+        
+        # Check if file is cached and unchanged
+        cached = self.get_cached_file_info(cache_key, stat)
+        if cached is not None:
+            return cached
+        
+        # File changed or not cached, calculate hash
+        file_hash = self.calculate_file_hash(file_path, stat.st_size)
+        file_info = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': file_hash
+        }
+        
+        # Update cache, a failed hash is not worth remembering
+        if file_hash:
+            self.update_file_cache(cache_key, file_info)
+        
+        return file_info
+    
+    def cache_copied_file(self, dest_path: str, source_info: Dict):
+        """
+        Record a freshly copied destination file in the cache with the source hash
+        Its contents equal the source, so it never needs to be read back and hashed
+        
+        Args:
+            dest_path: Destination file path
+            source_info: Source file information including its hash
+        """
+        if not source_info['hash']:
+            return
+        
+        try:
+            dest_stat = os.stat(dest_path)
+            cache_key = self.get_cache_key(dest_path, dest_stat)
+        except (IOError, OSError):
+            return
+        
+        self.update_file_cache(cache_key, {
+            'size': dest_stat.st_size,
+            'mtime_ns': dest_stat.st_mtime_ns,
+            'hash': source_info['hash']
+        })
+    
+    def files_have_same_content(self, source_file: str, dest_file: str,
+                                chunk_size: int = 1024 * 1024) -> bool:
+        """
+        Compare two files byte by byte, stopping at the first mismatch
+        
+        Args:
+            source_file: Source file path
+            dest_file: Destination file path
+            chunk_size: Size of chunks to read at a time
             
+        Returns:
+            True if both files have identical contents, False otherwise
+        """
+        try:
+            # Buffered read(n) keeps reading until n bytes or EOF, a raw read may return less
+            with open(source_file, "rb") as src, open(dest_file, "rb") as dst:
+                while True:
+                    src_chunk = src.read(chunk_size)
+                    dst_chunk = dst.read(chunk_size)
+                    if src_chunk != dst_chunk:
+                        return False
+                    if not src_chunk:
+                        return True
         except (IOError, OSError) as e:
-            self.logger.error(f"Error getting file info for {file_path}: {e}")
-            self.stats['errors'] += 1
-            return None
+            self.logger.error("Error comparing %s and %s: %s", source_file, dest_file, e)
+            self.increment_stat('errors')
+            return False
     
-    def files_are_different(self, source_info: Dict, dest_info: Dict) -> bool:
+    def files_are_different(self, source_file: str, dest_file: str,
+                            source_info: Dict, dest_stat: os.stat_result) -> bool:
         """
-        Compare two files to determine if they are different
+        Compare the contents of two files of the same size
         
         Args:
-            source_info: Source file information
-            dest_info: Destination file information
+            source_file: Source file path
+            dest_file: Destination file path
+            source_info: Source file information (--checksum only)
+            dest_stat: Destination file stat result
             
         Returns:
             True if files are different, False if they are the same
         """
-        if dest_info is None:
-            return True
+        # A streaming compare is cheaper than hashing both sides
+        if not self.checksum:
+            if not self.files_have_same_content(source_file, dest_file):
+                return True
+            # Take over the source times so the next quick check skips the file
+            if not self.dry_run:
+                try:
+                    shutil.copystat(source_file, dest_file)
+                except (IOError, OSError) as e:
+                    self.logger.error("Error updating times of %s: %s", dest_file, e)
+                    self.increment_stat('errors')
+            return False
         
-        # Compare by hash first (most reliable)
+        # Copied destinations are cached with the source hash, so this
+        # only reads the destination if it changed outside of a sync
+        dest_info = self.get_file_info(dest_file, dest_stat)
         if source_info['hash'] and dest_info['hash']:
             return source_info['hash'] != dest_info['hash']
         
-        # Fallback to size and modification time
-        if source_info['size'] != dest_info['size']:
-            return True
-        
-        # Allow for small time differences due to filesystem precision
-        time_diff = abs(source_info['mtime'] - dest_info['mtime'])
-        return time_diff > 1.0  # More than 1 second difference
+        return True
     
-    def copy_file(self, source_path: Path, dest_path: Path) -> bool:
+    def copy_file(self, source_path: str, dest_path: str, file_size: int) -> bool:
         """
         Copy a file from source to destination
         
         Args:
             source_path: Source file path
             dest_path: Destination file path
+            file_size: Size of the source file in bytes
             
         Returns:
             True if successful, False otherwise
         """
         try:
             # Create destination directory if it doesn't exist
-            dest_dir = dest_path.parent
-            if not dest_dir.exists():
-                if not self.dry_run:
-                    dest_dir.mkdir(parents=True, exist_ok=True)
-                    self.logger.debug(f"Created directory: {dest_dir}")
-                else:
-                    self.logger.debug(f"Would create directory: {dest_dir}")
-                self.stats['directories_created'] += 1
+            dest_dir = os.path.dirname(dest_path)
+            if dest_dir not in self.known_dirs:
+                if not os.path.isdir(dest_dir):
+                    if not self.dry_run:
+                        os.makedirs(dest_dir, exist_ok=True)
+                        self.safe_log(logging.DEBUG, "Created directory: %s", dest_dir)
+                    else:
+                        self.safe_log(logging.DEBUG, "Would create directory: %s", dest_dir)
+                    self.increment_stat('directories_created')
+                self.known_dirs.add(dest_dir)
             
-            # Copy the file
+            # Copy the file, CopyFileExW also preserves timestamps and attributes
             if not self.dry_run:
-                shutil.copy2(source_path, dest_path)
-                self.safe_log('info', "Copied", f"{source_path} -> {dest_path}")
+                if _win32 is not None:
+                    _win32.copy_file(source_path, dest_path)
+                else:
+                    self.copy_file_data(source_path, dest_path, file_size)
+                    shutil.copystat(source_path, dest_path)
+                self.safe_log(logging.INFO, "Copied: %s -> %s", source_path, dest_path)
             else:
-                self.safe_log('info', "Would copy", f"{source_path} -> {dest_path}")
+                self.safe_log(logging.INFO, "Would copy: %s -> %s", source_path, dest_path)
             
             # Update statistics
-            file_size = source_path.stat().st_size
-            self.stats['files_copied'] += 1
-            self.stats['bytes_copied'] += file_size
+            self.increment_stat('files_copied')
+            self.increment_stat('bytes_copied', file_size)
             
             return True
             
         except (IOError, OSError) as e:
-            self.logger.error(f"Error copying {source_path} to {dest_path}: {e}")
-            self.stats['errors'] += 1
+            self.logger.error("Error copying %s to %s: %s", source_path, dest_path, e)
+            self.increment_stat('errors')
             return False
     
-    def should_exclude_path(self, path: Path) -> bool:
-        """Check if path should be excluded (Mac hidden folders/files)"""
-        return any(part in self.mac_exclusions for part in path.parts)
-    
-    def count_files(self) -> int:
-        """Count total files to process for progress tracking"""
-        count = 0
-        for root, dirs, files in os.walk(self.source):
-            dirs[:] = [d for d in dirs if d not in self.mac_exclusions]
-            for file_name in files:
-                source_file = Path(root) / file_name
-                if not self.should_exclude_path(source_file):
-                    count += 1
-        return count
-    
-    def show_progress(self, current_file: str = ""):
-        """Display progress bar"""
-        if self.total_files == 0:
+    def copy_file_data(self, source_path: str, dest_path: str, file_size: int):
+        """
+        Copy file contents with the fastest mechanism the OS offers
+        
+        Args:
+            source_path: Source file path
+            dest_path: Destination file path
+            file_size: Size of the source file in bytes
+        """
+        # shutil already uses fcopyfile() on macOS
+        if sys.platform == 'darwin':
+            shutil.copyfile(source_path, dest_path)
             return
         
-        progress = self.processed_files / self.total_files
-        bar_length = 40
-        filled_length = int(bar_length * progress)
-        bar = '#' * filled_length + '-' * (bar_length - filled_length)
+        with open(source_path, 'rb') as fsrc, open(dest_path, 'wb') as fdst:
+            src_fd = fsrc.fileno()
+            dst_fd = fdst.fileno()
+            
+            # Linux 4.5+, reflinks on btrfs/XFS make this O(metadata)
+            if hasattr(os, 'copy_file_range'):
+                copy_range = lambda offset, count: os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+                if self.copy_in_kernel(copy_range, file_size):
+                    return
+            
+            # Keeps the data in kernel space, file-to-file sendfile is Linux only
+            if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+                send = lambda offset, count: os.sendfile(dst_fd, src_fd, offset, count)
+                if self.copy_in_kernel(send, file_size):
+                    return
+            
+            shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+    
+    def copy_in_kernel(self, copy_func, file_size: int) -> bool:
+        """
+        Copy a whole file with copy_file_range or sendfile
+        
+        Args:
+            copy_func: Function taking (offset, count) and returning the bytes copied
+            file_size: Size of the source file in bytes
+            
+        Returns:
+            True if the file was copied, False if the call is not supported
+            and nothing has been copied yet
+        """
+        offset = 0
+        while True:
+            try:
+                copied = copy_func(offset, KERNEL_COPY_CHUNK)
+            except OSError as e:
+                if offset == 0 and e.errno in KERNEL_COPY_UNSUPPORTED:
+                    return False
+                raise
+            if copied == 0:
+                # procfs-style files and some FUSE mounts report EOF right away
+                if offset == 0 and file_size > 0:
+                    return False
+                return True
+            offset += copied
+    
+    def scan_tree(self):
+        """
+        Walk the source tree with os.scandir, reusing each entry's cached stat
+        On Windows the native listing also fills in st_ino and st_dev
+        
+        Yields:
+            Tuples of (source file, destination file, source stat)
+        """
+        scandir = _win32.scandir if _win32 is not None else os.scandir
+        stack = [(str(self.source), str(self.destination))]
+        while stack:
+            source_root, dest_root = stack.pop()
+            try:
+                with scandir(source_root) as entries:
+                    for entry in entries:
+                        # Skip Mac hidden files and directories, excluded directories
+                        # are never descended into so ancestors need no check
+                        if entry.name in self.mac_exclusions:
+                            if not entry.is_dir():
+                                self.increment_stat('files_excluded')
+                                self.safe_log(logging.DEBUG, "Excluded (Mac hidden): %s", entry.path)
+                            continue
+                        
+                        dest_path = os.path.join(dest_root, entry.name)
+                        try:
+                            # Like os.walk, do not descend into symlinked directories
+                            if entry.is_dir():
+                                if not entry.is_symlink():
+                                    stack.append((entry.path, dest_path))
+                                continue
+                            source_stat = entry.stat()
+                        except (IOError, OSError) as e:
+                            self.logger.error("Error getting file info for %s: %s", entry.path, e)
+                            self.increment_stat('errors')
+                            continue
+                        
+                        # Opening a named pipe blocks, sockets and devices cannot be copied
+                        if not stat.S_ISREG(source_stat.st_mode):
+                            self.logger.error("Skipping %s: not a regular file", entry.path)
+                            self.increment_stat('errors')
+                            continue
+                        
+                        yield entry.path, dest_path, source_stat
+            except (IOError, OSError) as e:
+                self.logger.error("Error reading directory %s: %s", source_root, e)
+                self.increment_stat('errors')
+    
+    def produce_files(self, files: queue.Queue):
+        """Walk the source tree in a background thread, feeding the bounded queue"""
+        try:
+            for item in self.scan_tree():
+                files.put(item)
+        except Exception as e:
+            self.scan_error = e
+        finally:
+            files.put(None)
+    
+    def iter_files(self):
+        """
+        Stream files from a background tree walk, so directory listing
+        overlaps with checking and hashing
+        
+        Yields:
+            Tuples of (source file, destination file, source stat)
+        """
+        files = queue.Queue(maxsize=QUEUE_SIZE)
+        producer = threading.Thread(target=self.produce_files, args=(files,),
+                                    name='rsync-scan', daemon=True)
+        producer.start()
+        
+        while True:
+            item = files.get()
+            if item is None:
+                break
+            yield item
+        
+        producer.join()
+        if self.scan_error is not None:
+            raise self.scan_error
+    
+    def check_file(self, source_file: str, dest_file: str,
+                   source_stat: os.stat_result) -> Tuple[bool, Dict]:
+        """
+        Decide whether a file needs to be copied, runs in a worker thread
+        
+        Args:
+            source_file: Source file path
+            dest_file: Destination file path
+            source_stat: Source file stat result from the tree walk
+            
+        Returns:
+            Tuple of (True if the file needs copying, source file information
+            with --checksum or None)
+        """
+        self.safe_log(logging.DEBUG, "Checking: %s", source_file)
         
-        percent = progress * 100
-        status = f"\r[{bar}] {percent:.1f}% ({self.processed_files}/{self.total_files})"
+        # With --checksum the source is hashed even if it will be copied anyway,
+        # the hash is cached for the copied destination file
+        source_info = self.get_file_info(source_file, source_stat) if self.checksum else None
+        
+        try:
+            dest_stat = os.stat(dest_file)
+        except OSError:
+            return True, source_info
+        
+        # Quick check on size and mtime before reading any contents
+        decision = quick_check(source_stat.st_size, source_stat.st_mtime_ns,
+                               dest_stat.st_size, dest_stat.st_mtime_ns)
+        if decision == COPY:
+            return True, source_info
+        if decision == SKIP and not self.checksum:
+            return False, source_info
+        return self.files_are_different(source_file, dest_file, source_info, dest_stat), source_info
+    
+    def show_progress(self, current_file: str = "", force: bool = False):
+        """
+        Display progress, the total is unknown while the tree is still being walked
+        Redraws are throttled to PROGRESS_INTERVAL_NS unless force is set
+        """
+        now = time.monotonic_ns()
+        if not force and now - self.last_progress_ns < PROGRESS_INTERVAL_NS:
+            return
+        self.last_progress_ns = now
+        
+        spinner = SPINNER[self.processed_files % len(SPINNER)]
+        status = (f"\r[{spinner}] {self.processed_files:,} files checked, "
+                  f"{self.format_bytes(self.stats['bytes_copied'])} copied")
         
         if current_file:
-            # Truncate filename if too long
+            # Truncate filename if too long, pad to overwrite longer names
+            current_file = os.path.basename(current_file)
             display_file = current_file if len(current_file) <= 50 else f"...{current_file[-47:]}"
-            status += f" - {display_file}"
+            status += f" - {display_file:<50}"
+        else:
+            # Clear the file name left over from the previous redraw
+            status += ' ' * 53
         
         print(status, end='', flush=True)
     
+    def handle_result(self, future, item: Tuple[str, str, os.stat_result]):
+        """
+        Copy or skip a file once its check has completed, runs in the main thread
+        
+        Args:
+            future: Completed future from check_file
+            item: Tuple of (source file, destination file, source stat)
+        """
+        source_file, dest_file, source_stat = item
+        self.increment_stat('files_checked')
+        self.processed_files += 1
+        
+        # Show progress
+        if not self.verbose:
+            self.show_progress(source_file)
+        
+        needs_copy, source_info = future.result()
+        if needs_copy:
+            copied = self.copy_file(source_file, dest_file, source_stat.st_size)
+            if copied and source_info is not None and not self.dry_run:
+                self.cache_copied_file(dest_file, source_info)
+        else:
+            self.increment_stat('files_skipped')
+            self.safe_log(logging.DEBUG, "Skipped (unchanged): %s", source_file)
+    
     def sync_directory(self):
         """Main synchronization method"""
-        self.logger.info(f"Starting sync: {self.source} -> {self.destination}")
-        self.logger.info(f"Dry run mode: {self.dry_run}")
-        
-        # Count total files for progress tracking
-        print("Counting files...")
-        self.total_files = self.count_files()
-        print(f"Found {self.total_files:,} files to process\n")
+        self.logger.info("Starting sync: %s -> %s", self.source, self.destination)
+        self.logger.info("Dry run mode: %s", self.dry_run)
+        self.logger.info("Checksum mode: %s", self.checksum)
         
         start_time = datetime.now()
         
-        # Walk through source directory
-        for root, dirs, files in os.walk(self.source):
-            source_root = Path(root)
-            # Calculate relative path from source
-            rel_path = source_root.relative_to(self.source)
-            dest_root = self.destination / rel_path
-            
-            # Skip Mac hidden directories
-            dirs[:] = [d for d in dirs if d not in self.mac_exclusions]
-            
-            # Process files in current directory
-            for file_name in files:
-                source_file = source_root / file_name
-                dest_file = dest_root / file_name
-                
-                # Skip Mac hidden files
-                if self.should_exclude_path(source_file):
-                    self.stats['files_excluded'] += 1
-                    if self.verbose:
-                        self.safe_log('debug', "Excluded (Mac hidden)", source_file)
-                    continue
-                
-                self.stats['files_checked'] += 1
-                self.processed_files += 1
-                
-                # Show progress
-                if not self.verbose:
-                    self.show_progress(str(source_file.name))
+        # Check files in parallel while the tree is walked,
+        # copy from the main thread as results arrive
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            for item in self.iter_files():
+                pending[executor.submit(self.check_file, *item)] = item
                 
-                if self.verbose:
-                    self.safe_log('debug', "Checking", source_file)
-                
-                # Get file information
-                source_info = self.get_file_info(source_file)
-                if source_info is None:
-                    continue
-                
-                dest_info = None
-                if dest_file.exists():
-                    dest_info = self.get_file_info(dest_file)
-                
-                # Check if files are different
-                if self.files_are_different(source_info, dest_info):
-                    self.copy_file(source_file, dest_file)
-                else:
-                    self.stats['files_skipped'] += 1
-                    if self.verbose:
-                        self.safe_log('debug', "Skipped (unchanged)", source_file)
+                # Bound the work in flight, handle results as they complete
+                if len(pending) >= self.max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.handle_result(future, pending.pop(future))
+            
+            for future in as_completed(pending):
+                self.handle_result(future, pending[future])
         
         end_time = datetime.now()
         duration = end_time - start_time
@@ -401,6 +852,7 @@ class RsyncClone:
         # Save cache and print summary
         self.save_cache()
         if not self.verbose:
+            self.show_progress(force=True)
             print()  # New line after progress bar
         self.print_summary(duration)
     
@@ -429,11 +881,9 @@ class RsyncClone:
     
     def format_bytes(self, bytes_value: int) -> str:
         """Format bytes into human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_value < 1024.0:
-                return f"{bytes_value:.1f} {unit}"
-            bytes_value /= 1024.0
-        return f"{bytes_value:.1f} PB"
+        # Each unit is 2**10 times the previous one, so the bit length picks the unit
+        unit_index = min(max(0, (bytes_value.bit_length() - 1) // 10), len(BYTE_UNITS) - 1)
+        return f"{bytes_value / (1 << (unit_index * 10)):.1f} {BYTE_UNITS[unit_index]}"
 
 
 def main():
@@ -447,6 +897,7 @@ Examples:
   python rsync_clone.py C:\\source C:\\backup --dry-run
   python rsync_clone.py C:\\source C:\\backup --verbose
   python rsync_clone.py C:\\source C:\\backup --dry-run --verbose
+  python rsync_clone.py C:\\source C:\\backup --checksum
         """
     )
     
@@ -456,6 +907,9 @@ Examples:
                        help='Show what would be done without actually doing it')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Show detailed output')
+    parser.add_argument('--checksum', '-c', action='store_true',
+                       help='Compare hashes of same-size files even when modification times match '
+                            '(hashes are cached while size and mtime are unchanged)')
     parser.add_argument('--version', action='version', version='rsync_clone 1.0.0')
     
     args = parser.parse_args()
@@ -465,7 +919,8 @@ Examples:
             source=args.source,
             destination=args.destination,
             dry_run=args.dry_run,
-            verbose=args.verbose
+            verbose=args.verbose,
+            checksum=args.checksum
         )
         rsync.sync_directory()
         